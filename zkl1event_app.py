@@ -14,17 +14,56 @@ The resulting JSON payload can be used as:
   - An artifact for Zama-style cryptographic / ZK research on event-based protocols
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import json
 import time
+import ctypes
 import argparse
-from typing import Any, Dict, List, Optional
-
-from web3 import Web3
+import functools
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional speedup
+    msgpack = None
+
+try:
+    from Crypto.Hash import keccak as _keccak
+except ImportError:  # pragma: no cover - optional speedup
+    try:
+        from Cryptodome.Hash import keccak as _keccak
+    except ImportError:
+        _keccak = None
 
 DEFAULT_RPC = os.getenv("RPC_URL", "https://mainnet.infura.io/v3/your_api_key")
 DEFAULT_BLOCKS = int(os.getenv("ZK_EVENT_BLOCKS", "200"))
+DEFAULT_CHUNK_SIZE = int(os.getenv("ZK_EVENT_CHUNK_SIZE", "1000"))
+DEFAULT_RPC_WORKERS = int(os.getenv("ZK_EVENT_RPC_WORKERS", "8"))
+DEFAULT_BATCH_SIZE = int(os.getenv("ZK_EVENT_BATCH_SIZE", "50"))
+DEFAULT_CACHE_DIR = os.getenv(
+    "ZK_EVENT_CACHE_DIR",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "zk_l1_event_commitment"
+    ),
+)
+CACHE_CONFIRMATIONS = int(os.getenv("ZK_EVENT_CACHE_CONFIRMATIONS", "64"))
+RPC_RETRIES = 3
+ZERO_HASH = b"\x00" * 32
 
 NETWORKS: Dict[int, str] = {
     1: "Ethereum Mainnet",
@@ -40,31 +79,39 @@ def network_name(cid: int) -> str:
     return NETWORKS.get(cid, f"Unknown (chain ID {cid})")
 
 
-def connect(rpc: str) -> Web3:
+def connect(rpc: str) -> Tuple[Web3, int, int]:
+    """Connect to the RPC endpoint and return (w3, chain_id, tip), queried once per run."""
+    from web3 import Web3
+
     start = time.time()
     w3 = Web3(Web3.HTTPProvider(rpc, request_kwargs={"timeout": 25}))
 
-    if not w3.is_connected():
-        print(f"❌ Failed to connect to RPC endpoint: {rpc}", file=sys.stderr)
-        sys.exit(1)
-
-    latency = time.time() - start
+    # The first real calls double as the connectivity check (no web3_clientVersion probe)
     try:
         cid = int(w3.eth.chain_id)
         tip = int(w3.eth.block_number)
-        print(
-            f"🌐 Connected to {network_name(cid)} (chainId {cid}, tip={tip}) in {latency:.2f}s",
-            file=sys.stderr,
-        )
-    except Exception:
-        print(f"🌐 Connected to RPC (chain info unavailable) in {latency:.2f}s", file=sys.stderr)
+    except Exception as e:
+        print(f"❌ Failed to connect to RPC endpoint: {rpc} ({e})", file=sys.stderr)
+        sys.exit(1)
+    latency = time.time() - start
 
-    return w3
+    print(
+        f"🌐 Connected to {network_name(cid)} (chainId {cid}, tip={tip}) in {latency:.2f}s",
+        file=sys.stderr,
+    )
+    return w3, cid, tip
+
+
+@functools.lru_cache(maxsize=1024)
+def _checksum(addr_lower: str) -> str:
+    from eth_utils import to_checksum_address
+
+    return to_checksum_address(addr_lower)
 
 
 def normalize_address(addr: str) -> str:
     try:
-        return Web3.to_checksum_address(addr.strip())
+        return _checksum(addr.strip().lower())
     except Exception:
         raise ValueError(f"Invalid address: {addr!r}")
 
@@ -82,28 +129,539 @@ def normalize_topic(topic: str) -> str:
     return topic.lower()
 
 
+class RawEvent(NamedTuple):
+    """One log in raw-bytes form, used for ordering and the commitment."""
+
+    blockNumber: int
+    txHash: bytes
+    logIndex: int
+    topics: List[bytes]
+    data: bytes
+
+
+def encode_event(ev: RawEvent) -> bytes:
+    """
+    Canonical binary encoding of one event (the Merkle leaf preimage).
+
+    blockNumber (u64 BE) | txHash (32B) | logIndex (u32 BE) |
+    topic count (u8) | topics (32B each) | data length (u32 BE) | data.
+    """
+    topics = ev.topics
+    data = ev.data
+    return b"".join(
+        (
+            ev.blockNumber.to_bytes(8, "big"),
+            ev.txHash,
+            ev.logIndex.to_bytes(4, "big"),
+            len(topics).to_bytes(1, "big"),
+            *topics,
+            len(data).to_bytes(4, "big"),
+            data,
+        )
+    )
+
+
+def keccak256(data: bytes) -> bytes:
+    """Keccak-256 digest of `data`, via pycryptodome when available."""
+    if _keccak is not None:
+        return _keccak.new(digest_bits=256, data=data).digest()
+    from eth_utils import keccak
+
+    return keccak(data)
+
+
+class KeccakBatcher:
+    """
+    Hash many preimages, four at a time when a native 4-lane Keccak is available.
+
+    The native backend is opt-in: a shared library named by ZK_KECCAK_LIB exporting:
+
+        void keccak_4x_256(const uint8_t *in0, const uint8_t *in1,
+                           const uint8_t *in2, const uint8_t *in3,
+                           size_t len, uint8_t *out);  /* out: 4 x 32 bytes */
+
+    Only equal-length inputs share a permutation, so preimages are grouped by
+    length; leftovers that do not fill a group of four are hashed one by one.
+    The library must reproduce keccak256() on a known-answer group before it is
+    used; without it (or if that check fails) every preimage goes through keccak256().
+    """
+
+    LANES = 4
+
+    def __init__(self, lib_path: Optional[str] = None) -> None:
+        self._keccak_4x = self._load(lib_path or os.getenv("ZK_KECCAK_LIB"))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _load(lib_path: Optional[str]) -> Optional[Any]:
+        """Resolve the native backend once per path; every batcher shares the result."""
+        if not lib_path:
+            return None
+        try:
+            fn = ctypes.CDLL(lib_path).keccak_4x_256
+        except (OSError, AttributeError) as e:
+            print(
+                f"⚠️  Batched Keccak backend unavailable ({e}); using scalar Keccak.",
+                file=sys.stderr,
+            )
+            return None
+        fn.argtypes = [ctypes.c_char_p] * 4 + [ctypes.c_size_t, ctypes.c_char_p]
+        fn.restype = None
+
+        # Known-answer check: the backend decides the commitment, so it must agree
+        # with keccak256() on a full 4-lane group before it is trusted.
+        inputs = [bytes([lane]) * 97 for lane in range(4)]
+        out = ctypes.create_string_buffer(32 * 4)
+        fn(*inputs, len(inputs[0]), out)
+        if out.raw != b"".join(keccak256(x) for x in inputs):
+            print(
+                f"⚠️  {lib_path}: keccak_4x_256 failed the known-answer check; "
+                "using scalar Keccak.",
+                file=sys.stderr,
+            )
+            return None
+        return fn
+
+    def hash_many(self, preimages: List[bytes]) -> List[bytes]:
+        if self._keccak_4x is None:
+            return [keccak256(p) for p in preimages]
+
+        digests: List[bytes] = [b""] * len(preimages)
+        by_len: Dict[int, List[int]] = {}
+        for i, p in enumerate(preimages):
+            by_len.setdefault(len(p), []).append(i)
+
+        out = ctypes.create_string_buffer(32 * self.LANES)
+        for length, idxs in by_len.items():
+            full = len(idxs) - len(idxs) % self.LANES
+            for j in range(0, full, self.LANES):
+                group = idxs[j : j + self.LANES]
+                self._keccak_4x(*(preimages[i] for i in group), length, out)
+                raw = out.raw
+                for lane, i in enumerate(group):
+                    digests[i] = raw[32 * lane : 32 * (lane + 1)]
+            for i in idxs[full:]:
+                digests[i] = keccak256(preimages[i])
+        return digests
+
+
+def merkle_root(leaves: List[bytes], batcher: Optional[KeccakBatcher] = None) -> bytes:
+    """
+    Binary Keccak Merkle root over `leaves`.
+
+    The leaf level is padded with zero hashes to the next power of two and
+    each parent is keccak(left || right). An empty tree commits to keccak(b"").
+    """
+    if not leaves:
+        return keccak256(b"")
+
+    batcher = batcher or KeccakBatcher()
+    level = list(leaves)
+    width = 1
+    while width < len(level):
+        width *= 2
+    level.extend([ZERO_HASH] * (width - len(level)))
+
+    while len(level) > 1:
+        level = batcher.hash_many([level[i] + level[i + 1] for i in range(0, len(level), 2)])
+    return level[0]
+
+
+def _hash_subtree(job: Tuple[List[bytes], int]) -> Tuple[List[bytes], bytes]:
+    """Worker: leaf hashes for one slice of preimages and the root of its zero-padded subtree."""
+    preimages, width = job
+    batcher = KeccakBatcher()
+    leaves = batcher.hash_many(preimages)
+    return leaves, merkle_root(leaves + [ZERO_HASH] * (width - len(leaves)), batcher)
+
+
+def merkle_commit_parallel(preimages: List[bytes], processes: int) -> Tuple[List[bytes], bytes]:
+    """
+    Same (leaves, root) as hashing serially, computed across `processes` workers.
+
+    The padded leaf level is cut into a power-of-two number of equal subtrees;
+    each worker hashes its leaves and folds its subtree, and the subtree roots
+    are folded here.
+    """
+    if not preimages:
+        return [], keccak256(b"")
+
+    # Resolve the native backend here so forked workers inherit it (and any warning) once
+    KeccakBatcher()
+    width = 1
+    while width < len(preimages):
+        width *= 2
+    parts = 1
+    while parts * 2 <= min(processes, width):
+        parts *= 2
+    if parts == 1:
+        batcher = KeccakBatcher()
+        leaves = batcher.hash_many(preimages)
+        return leaves, merkle_root(leaves, batcher)
+    span = width // parts
+
+    jobs = [(preimages[i * span : (i + 1) * span], span) for i in range(parts)]
+    with ProcessPoolExecutor(max_workers=parts) as executor:
+        results = list(executor.map(_hash_subtree, jobs))
+
+    leaves = [leaf for part, _ in results for leaf in part]
+    return leaves, merkle_root([root for _, root in results])
+
+
+def topic_hex(cache: Dict[bytes, str], topic: bytes) -> str:
+    """0x-hex of `topic`, shared through `cache` so each distinct topic is encoded once."""
+    hx = cache.get(topic)
+    if hx is None:
+        hx = cache[topic] = "0x" + topic.hex()
+    return hx
+
+
+def count_topic0(
+    events: List[RawEvent],
+    topic_cache: Optional[Dict[bytes, str]] = None,
+) -> Dict[str, int]:
+    """Occurrences of each topic0 (hex) across `events` (raw bytes form)."""
+    cache = topic_cache if topic_cache is not None else {}
+    counts = Counter(ev.topics[0] for ev in events if ev.topics)
+    return {topic_hex(cache, t): n for t, n in counts.items()}
+
+
+# RawEvent field positions: (blockNumber, txHash, logIndex)
+_event_key = itemgetter(0, 1, 2)
+
+
+def block_windows(from_block: int, to_block: int, size: int) -> List[Tuple[int, int]]:
+    """Split [from_block, to_block] into inclusive windows of at most `size` blocks."""
+    return [(a, min(a + size - 1, to_block)) for a in range(from_block, to_block + 1, size)]
+
+
+def bloom_bits(item: bytes) -> List[Tuple[int, int]]:
+    """(byte index, bit mask) of the 3 logsBloom bits set for `item` (yellow paper M3:2048)."""
+    h = keccak256(item)
+    bits = []
+    for i in (0, 2, 4):
+        bit = ((h[i] << 8) | h[i + 1]) & 2047
+        bits.append((255 - bit // 8, 1 << (bit % 8)))
+    return bits
+
+
+def bloom_matches(blooms: List[bytes], bits: List[Tuple[int, int]]) -> List[bool]:
+    """Whether each 256-byte bloom may contain all of `bits` (no false negatives)."""
+    return [all(bloom[i] & m == m for i, m in bits) for bloom in blooms]
+
+
+def iter_blooms(
+    w3: Web3,
+    from_block: int,
+    to_block: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_RPC_WORKERS,
+) -> Iterator[Tuple[int, List[bytes]]]:
+    """
+    Yield (first block, logsBloom list) per group of `batch_size` headers in
+    [from_block, to_block], one JSON-RPC batch per group; falls back to
+    concurrent eth_getBlockByNumber calls if batching fails.
+    """
+    use_batch = True
+    for a, b in block_windows(from_block, to_block, batch_size):
+        blocks: List[Any] = []
+        if use_batch:
+            try:
+                with w3.batch_requests() as batch:
+                    for n in range(a, b + 1):
+                        batch.add(w3.eth.get_block(n))
+                    blocks = batch.execute()
+            except Exception as e:
+                print(
+                    f"⚠️  Batch eth_getBlockByNumber failed ({e}); "
+                    f"fetching headers with {workers} worker(s).",
+                    file=sys.stderr,
+                )
+                use_batch = False
+        if not use_batch:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                blocks = list(executor.map(w3.eth.get_block, range(a, b + 1)))
+        yield a, [bytes(blk["logsBloom"]) for blk in blocks]
+
+
+def bloom_windows(
+    w3: Web3,
+    address: str,
+    from_block: int,
+    to_block: int,
+    topic0: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = DEFAULT_RPC_WORKERS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[Tuple[int, int]]:
+    """
+    The `chunk_size` spans of block_windows() that may hold matching logs,
+    judged by each header's logsBloom. Spans with no candidate block are
+    dropped; the rest are trimmed to [first candidate, last candidate], so the
+    filter never issues more eth_getLogs calls than the plain path. Blooms are
+    tested as each header batch arrives and not kept.
+    """
+    if from_block > to_block:
+        return []
+
+    bits = bloom_bits(bytes.fromhex(address[2:]))
+    if topic0:
+        bits += bloom_bits(bytes.fromhex(topic0[2:]))
+
+    spans: Dict[int, Tuple[int, int]] = {}
+    kept = 0
+    for first, blooms in iter_blooms(w3, from_block, to_block, batch_size, workers):
+        for offset, hit in enumerate(bloom_matches(blooms, bits)):
+            if not hit:
+                continue
+            n = first + offset
+            span = (n - from_block) // chunk_size
+            lo, _ = spans.get(span, (n, n))
+            spans[span] = (lo, n)
+            kept += 1
+
+    windows = [spans[k] for k in sorted(spans)]
+    print(
+        f"   🌸 logsBloom kept {kept}/{to_block - from_block + 1} blocks in {len(windows)} window(s)",
+        file=sys.stderr,
+    )
+    return windows
+
+
+def get_logs_with_retry(w3: Web3, filter_kwargs: Dict[str, Any]) -> List[Any]:
+    """eth_getLogs with exponential backoff (0.5s, 1s, 2s, ...) on errors."""
+    for attempt in range(RPC_RETRIES + 1):
+        try:
+            return list(w3.eth.get_logs(filter_kwargs))
+        except Exception as e:
+            if attempt == RPC_RETRIES:
+                raise
+            delay = 0.5 * (2 ** attempt)
+            print(
+                f"   ⚠️  eth_getLogs [{filter_kwargs['fromBlock']}, {filter_kwargs['toBlock']}] "
+                f"failed ({e}); retrying in {delay:.1f}s...",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
+    return []
+
+
+def get_logs_per_window(
+    w3: Web3,
+    filter_kwargs: Dict[str, Any],
+    windows: List[Tuple[int, int]],
+    workers: int = DEFAULT_RPC_WORKERS,
+) -> List[List[Any]]:
+    """Fetch each window with its own eth_getLogs call on a thread pool; one list per window."""
+    results: List[List[Any]] = [[] for _ in windows]
+    if not windows:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(windows)))) as executor:
+        futures = {
+            executor.submit(
+                get_logs_with_retry, w3, {**filter_kwargs, "fromBlock": a, "toBlock": b}
+            ): i
+            for i, (a, b) in enumerate(windows)
+        }
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+    return results
+
+
+def _batch_unsupported(exc: Exception) -> bool:
+    """Whether a batch failure means the client or endpoint cannot batch at all."""
+    return isinstance(exc, (AttributeError, NotImplementedError)) or "batch" in str(exc).lower()
+
+
+def get_logs_batched(
+    w3: Web3,
+    filter_kwargs: Dict[str, Any],
+    windows: List[Tuple[int, int]],
+    workers: int = DEFAULT_RPC_WORKERS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[Any]:
+    """
+    Fetch logs for every window via JSON-RPC batches of at most `batch_size` calls.
+
+    Windows that fail inside a batch are retried individually; if the client or
+    endpoint rejects batching outright, the remaining windows are fetched with
+    parallel per-window eth_getLogs calls.
+    """
+    if not windows:
+        return []
+    if len(windows) == 1:
+        a, b = windows[0]
+        return get_logs_with_retry(w3, {**filter_kwargs, "fromBlock": a, "toBlock": b})
+
+    results: List[List[Any]] = [[] for _ in windows]
+    failed: List[int] = []
+    batched_ok = False
+
+    for start in range(0, len(windows), batch_size):
+        group = list(range(start, min(start + batch_size, len(windows))))
+        try:
+            with w3.batch_requests() as batch:
+                for i in group:
+                    a, b = windows[i]
+                    batch.add(w3.eth.get_logs({**filter_kwargs, "fromBlock": a, "toBlock": b}))
+                responses = batch.execute()
+        except Exception as e:
+            if not batched_ok and _batch_unsupported(e):
+                print(
+                    f"⚠️  Batch requests unsupported ({e}); "
+                    f"fetching windows with {workers} worker(s).",
+                    file=sys.stderr,
+                )
+                failed.extend(range(start, len(windows)))
+                break
+            print(
+                f"   ⚠️  Batch of {len(group)} eth_getLogs windows failed ({e}); "
+                "retrying them individually.",
+                file=sys.stderr,
+            )
+            failed.extend(group)
+            continue
+
+        batched_ok = True
+        for i, res in zip(group, responses):
+            if isinstance(res, Exception) or (isinstance(res, dict) and "error" in res):
+                failed.append(i)
+            else:
+                results[i] = list(res)
+
+    retried = get_logs_per_window(w3, filter_kwargs, [windows[i] for i in failed], workers)
+    for i, window_logs in zip(failed, retried):
+        results[i] = window_logs
+
+    logs: List[Any] = []
+    for window_logs in results:
+        logs.extend(window_logs)
+    return logs
+
+
+def log_cache_path(
+    cache_dir: str,
+    chain_id: Optional[int],
+    address: str,
+    topic0: Optional[str],
+    from_block: int,
+) -> str:
+    """
+    Cache file for a scan starting at `from_block`. The end block is stored in
+    the file rather than the key, so later runs can extend it with just the tail.
+    """
+    key = f"{chain_id}|{address.lower()}|{topic0 or ''}|{from_block}"
+    ext = "msgpack" if msgpack is not None else "json"
+    return os.path.join(cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.{ext}")
+
+
+def load_log_cache(path: str) -> Tuple[List[RawEvent], Optional[int]]:
+    """Return (cached events, last cached block), or ([], None) on a miss."""
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+        if msgpack is not None:
+            doc = msgpack.unpackb(blob)
+            events = [
+                RawEvent(block, tx_hash, log_index, list(topics), data)
+                for block, tx_hash, log_index, topics, data in doc["events"]
+            ]
+        else:
+            doc = json.loads(blob)
+            events = [
+                RawEvent(
+                    block,
+                    bytes.fromhex(tx_hash),
+                    log_index,
+                    [bytes.fromhex(t) for t in topics],
+                    bytes.fromhex(data),
+                )
+                for block, tx_hash, log_index, topics, data in doc["events"]
+            ]
+        return events, int(doc["toBlock"])
+    except FileNotFoundError:
+        return [], None
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable log cache {path}: {e}", file=sys.stderr)
+        return [], None
+
+
+def save_log_cache(path: str, events: List[RawEvent], to_block: int) -> None:
+    """Atomically write `events` (all logs up to `to_block`) to the cache file."""
+    if msgpack is not None:
+        blob = msgpack.packb(
+            {"toBlock": to_block, "events": [list(ev) for ev in events]}, use_bin_type=True
+        )
+    else:
+        rows = [
+            [
+                ev.blockNumber,
+                ev.txHash.hex(),
+                ev.logIndex,
+                [t.hex() for t in ev.topics],
+                ev.data.hex(),
+            ]
+            for ev in events
+        ]
+        blob = json.dumps({"toBlock": to_block, "events": rows}, separators=(",", ":")).encode()
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️  Could not write log cache {path}: {e}", file=sys.stderr)
+
+
 def fetch_events(
     w3: Web3,
     address: str,
     from_block: int,
     to_block: int,
+    head: int,
     topic0: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    rpc_workers: int = DEFAULT_RPC_WORKERS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_bloom: bool = False,
+    cache_dir: Optional[str] = None,
+    chain_id: Optional[int] = None,
+    hash_processes: int = 0,
 ) -> Dict[str, Any]:
-    """Fetch logs for a contract over a block range and compute a Keccak commitment."""
+    """
+    Fetch logs for a contract over a block range and compute a Keccak commitment.
+
+    With `cache_dir`, logs older than CACHE_CONFIRMATIONS blocks are kept on disk
+    and later runs over the same start block only query the uncached tail.
+    """
     if from_block > to_block:
         from_block, to_block = to_block, from_block
 
-    head = int(w3.eth.block_number)
     to_block_clamped = min(to_block, head)
 
-    print(
-        f"🔍 Fetching logs for {address} in blocks [{from_block}, {to_block_clamped}]...",
-        file=sys.stderr,
+    cache_path = (
+        log_cache_path(cache_dir, chain_id, address, topic0, from_block) if cache_dir else None
     )
+    cached_events: List[RawEvent] = []
+    cached_to = from_block - 1
+    if cache_path:
+        cached_events, last = load_log_cache(cache_path)
+        if last is not None:
+            cached_to = last
+            print(
+                f"💾 Loaded {len(cached_events)} cached logs through block {last}",
+                file=sys.stderr,
+            )
+            if cached_to > to_block_clamped:
+                cached_events = [ev for ev in cached_events if ev.blockNumber <= to_block_clamped]
+    fetch_from = cached_to + 1
 
     filter_kwargs: Dict[str, Any] = {
         "address": address,
-        "fromBlock": from_block,
+        "fromBlock": fetch_from,
         "toBlock": to_block_clamped,
     }
 
@@ -111,42 +669,76 @@ def fetch_events(
         filter_kwargs["topics"] = [topic0]
 
     t0 = time.time()
-    logs = w3.eth.get_logs(filter_kwargs)
+    logs: List[Any] = []
+    if fetch_from <= to_block_clamped:
+        print(
+            f"🔍 Fetching logs for {address} in blocks [{fetch_from}, {to_block_clamped}]...",
+            file=sys.stderr,
+        )
+        if use_bloom:
+            windows = bloom_windows(
+                w3,
+                address,
+                fetch_from,
+                to_block_clamped,
+                topic0,
+                chunk_size,
+                rpc_workers,
+                batch_size,
+            )
+        else:
+            windows = block_windows(fetch_from, to_block_clamped, chunk_size)
+        logs = get_logs_batched(w3, filter_kwargs, windows, rpc_workers, batch_size)
     elapsed = time.time() - t0
 
-    events: List[Dict[str, Any]] = []
-    topics_seen: Dict[str, int] = {}
-
-    for idx, lg in enumerate(logs, 1):
-        block_num = int(lg["blockNumber"])
-        tx_hash = Web3.to_hex(lg["transactionHash"])
-        log_index = int(lg["logIndex"])
-        topics = [Web3.to_hex(t) for t in lg["topics"]]
-        data_hex = Web3.to_hex(lg["data"])
-
-        topic0_hex = topics[0] if topics else None
-        if topic0_hex:
-            topics_seen[topic0_hex] = topics_seen.get(topic0_hex, 0) + 1
-
-        events.append(
-            {
-                "blockNumber": block_num,
-                "txHash": tx_hash,
-                "logIndex": log_index,
-                "topics": topics,
-                "data": data_hex,
-            }
+    new_events: List[RawEvent] = [
+        RawEvent(
+            int(lg["blockNumber"]),
+            bytes(lg["transactionHash"]),
+            int(lg["logIndex"]),
+            [bytes(t) for t in lg["topics"]],
+            bytes(lg["data"]),
         )
+        for lg in logs
+    ]
+    print(f"   ⏳ processed {len(new_events)} logs", file=sys.stderr)
+
+    raw_events = cached_events + new_events
 
-        if idx % 50 == 0:
-            print(f"   ⏳ processed {idx}/{len(logs)} logs...", file=sys.stderr)
+    if cache_path:
+        # Only persist blocks deep enough that a reorg is not expected to touch them
+        safe_to = min(to_block_clamped, head - CACHE_CONFIRMATIONS)
+        if safe_to > cached_to:
+            save_log_cache(
+                cache_path, [ev for ev in raw_events if ev.blockNumber <= safe_to], safe_to
+            )
 
     # Sort events deterministically for commitment stability
-    events.sort(key=lambda e: (e["blockNumber"], e["txHash"], e["logIndex"]))
+    raw_events.sort(key=_event_key)
 
-    # Compute Keccak commitment over the ordered events
-    encoded = json.dumps(events, sort_keys=True, separators=(",", ":")).encode()
-    commitment = Web3.keccak(encoded).hex()
+    # Commit to the ordered events as a Merkle tree of per-event Keccak leaves
+    preimages = [encode_event(ev) for ev in raw_events]
+    if hash_processes > 1:
+        leaves, root = merkle_commit_parallel(preimages, hash_processes)
+    else:
+        batcher = KeccakBatcher()
+        leaves = batcher.hash_many(preimages)
+        root = merkle_root(leaves, batcher)
+    commitment = "0x" + root.hex()
+
+    topic_cache: Dict[bytes, str] = {}
+    topics_seen = count_topic0(raw_events, topic_cache)
+    events: List[Dict[str, Any]] = [
+        {
+            "blockNumber": ev.blockNumber,
+            "txHash": "0x" + ev.txHash.hex(),
+            "logIndex": ev.logIndex,
+            "topics": [topic_hex(topic_cache, t) for t in ev.topics],
+            "data": "0x" + ev.data.hex(),
+            "leafHash": "0x" + leaf.hex(),
+        }
+        for ev, leaf in zip(raw_events, leaves)
+    ]
 
     return {
         "address": address,
@@ -157,6 +749,7 @@ def fetch_events(
         "topicsCount": topics_seen,
         "events": events,
         "commitmentKeccak": commitment,
+        "merkleRoot": commitment,
         "elapsedSec": round(elapsed, 3),
     }
 
@@ -195,6 +788,39 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_BLOCKS,
         help="Number of recent blocks if from/to are not provided.",
     )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Blocks per eth_getLogs window.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Max eth_getLogs windows per JSON-RPC batch request.",
+    )
+    parser.add_argument(
+        "--rpc-workers",
+        type=int,
+        default=DEFAULT_RPC_WORKERS,
+        help="Concurrent eth_getLogs calls when the provider does not accept batch requests.",
+    )
+    parser.add_argument(
+        "--bloom-filter",
+        action="store_true",
+        help="Pre-screen blocks by header logsBloom and only query eth_getLogs where it may match.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the on-disk log cache (ZK_EVENT_CACHE_DIR), used only with --from-block.",
+    )
+    parser.add_argument(
+        "--parallel-hash",
+        action="store_true",
+        help="Hash Merkle subtrees on one process per CPU (worth it for large event sets).",
+    )
     parser.add_argument(
         "--pretty",
         action="store_true",
@@ -236,8 +862,19 @@ def main() -> None:
         print("❌ --blocks must be > 0", file=sys.stderr)
         sys.exit(1)
 
-    w3 = connect(args.rpc)
-    tip = int(w3.eth.block_number)
+    if args.chunk_size <= 0:
+        print("❌ --chunk-size must be > 0", file=sys.stderr)
+        sys.exit(1)
+
+    if args.batch_size <= 0:
+        print("❌ --batch-size must be > 0", file=sys.stderr)
+        sys.exit(1)
+
+    if args.rpc_workers <= 0:
+        print("❌ --rpc-workers must be > 0", file=sys.stderr)
+        sys.exit(1)
+
+    w3, chain_id, tip = connect(args.rpc)
 
     if args.from_block is None and args.to_block is None:
         to_block = tip
@@ -248,8 +885,9 @@ def main() -> None:
             0, to_block - args.blocks + 1
         )
 
+    now_utc = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
     print(
-        f"📅 zk_l1_event_commitment started at UTC {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())}",
+        f"📅 zk_l1_event_commitment started at UTC {now_utc}",
         file=sys.stderr,
     )
     print(
@@ -263,16 +901,27 @@ def main() -> None:
         address=addr,
         from_block=int(from_block),
         to_block=int(to_block),
+        head=tip,
         topic0=topic0,
+        chunk_size=args.chunk_size,
+        rpc_workers=args.rpc_workers,
+        batch_size=args.batch_size,
+        use_bloom=args.bloom_filter,
+        # Only a fixed --from-block gives a stable cache key; the default tip-relative
+        # window moves every run and would only leave unreadable files behind.
+        cache_dir=DEFAULT_CACHE_DIR
+        if args.from_block is not None and not args.no_cache
+        else None,
+        chain_id=chain_id,
+        hash_processes=(os.cpu_count() or 1) if args.parallel_hash else 0,
     )
     elapsed = time.time() - t0
 
-    chain_id = int(w3.eth.chain_id)
     payload = {
         "mode": "zk_l1_event_commitment",
         "network": network_name(chain_id),
         "chainId": chain_id,
-        "generatedAtUtc": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+        "generatedAtUtc": now_utc,
         "data": snapshot,
     }
 
@@ -298,9 +947,15 @@ def main() -> None:
         )
 
     if args.pretty:
-        print(json.dumps(payload, indent=2, sort_keys=True))
+        json.dump(payload, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+    elif orjson is not None:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS))
+        sys.stdout.buffer.write(b"\n")
     else:
-        print(json.dumps(payload, separators=(",", ":"), sort_keys=True))
+        json.dump(payload, sys.stdout, separators=(",", ":"), sort_keys=True)
+        sys.stdout.write("\n")
 
 
 if __name__ == "__main__":